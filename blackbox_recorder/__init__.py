@@ -0,0 +1,3 @@
+from .recorder import Recorder, get_recorder, del_recorder, enable_async_logging, disable_async_logging
+
+__all__ = ["Recorder", "get_recorder", "del_recorder", "enable_async_logging", "disable_async_logging"]
@@ -13,18 +13,146 @@ the instance, in the same way as logging.getLogger().
 """
 
 import inspect
+import io
 import logging
-from collections import defaultdict
+import pickle
+import queue
+import sys
+import threading
+import weakref
 from copy import deepcopy
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from operator import itemgetter
 from pprint import pformat
-from typing import Dict, Iterable, Union, Set, Optional
+from types import CodeType
+from typing import BinaryIO, Dict, FrozenSet, Iterable, List, Union, Set, Optional, Tuple
 
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
 
+CO_VARARGS = inspect.CO_VARARGS
+CO_VARKEYWORDS = inspect.CO_VARKEYWORDS
 
-class Recorder(defaultdict):
-    def __init__(self) -> None:
-        super().__init__(dict)
+_IMMUTABLE = (bool, int, float, complex, str, bytes, type(None), frozenset)
+_NO_SUPPRESS: FrozenSet[str] = frozenset()
+
+# Keys of live objects by id. Each entry holds a weak reference whose callback removes
+# the entry when the object dies, before its id can be reused.
+_key_cache: Dict[int, Tuple[str, weakref.ref]] = {}
+
+
+def _parse_code(code: CodeType) -> Tuple[Tuple[str, ...], Optional[str], Optional[str]]:
+    """
+    Extract the argument names of a code object.
+
+    :param code: Code object of the recorded function.
+    :return: Names of the named arguments, name of *args or None, name of **kwargs or None.
+    """
+    names = code.co_varnames
+    nargs = code.co_argcount + code.co_kwonlyargcount
+
+    idx = nargs
+    varargs = None
+    if code.co_flags & CO_VARARGS:
+        varargs = names[idx]
+        idx += 1
+
+    keywords = None
+    if code.co_flags & CO_VARKEYWORDS:
+        keywords = names[idx]
+
+    return names[:nargs], varargs, keywords
+
+
+@lru_cache(maxsize=1024)
+def _arg_plan(code: CodeType, suppress: FrozenSet[str]) -> Tuple[Tuple[str, ...], Optional[str], Optional[str]]:
+    """
+    Argument names to record for a code object, without "self" and the suppressed names.
+
+    :param code: Code object of the recorded function.
+    :param suppress: Names to leave out.
+    :return: Names of the named arguments to record, name of *args or None, name of **kwargs or None.
+    """
+    args, varargs, keywords = _parse_code(code)
+    args = tuple(a for a in args if a != "self" and a not in suppress)
+    return args, varargs, keywords
+
+
+def _all_immutable(values: Iterable) -> bool:
+    return all(isinstance(x, _IMMUTABLE) for x in values)
+
+
+def _copy(value, _deepcopy=deepcopy):
+    """
+    Copy a recorded dict, list or tuple.
+
+    Containers holding only immutable values get a single shallow copy, or none at all
+    for tuples. Anything else goes through deepcopy, which keeps cycles and shared
+    references intact.
+
+    :param value: Value to copy.
+    :return: Copy of the value.
+    """
+    cls = type(value)
+    if cls is dict:
+        if _all_immutable(value.keys()) and _all_immutable(value.values()):
+            return value.copy()
+    elif cls is list:
+        if _all_immutable(value):
+            return value[:]
+    elif cls is tuple:
+        if _all_immutable(value):
+            return value
+
+    return _deepcopy(value)
+
+
+def _make_key(key: Union[str, object]) -> str:
+    """
+    Create a string key from objects class name and id.
+
+    :param key: Key
+    :return: String representation for the key.
+    """
+    if isinstance(key, str):
+        return key
+
+    i = id(key)
+    cached = _key_cache.get(i)
+    if cached is not None:
+        return cached[0]
+
+    k = f"{key.__class__.__name__} {key.__class__} object at 0x{i:x}"
+    try:
+        _key_cache[i] = (k, weakref.ref(key, lambda _, i=i: _key_cache.pop(i, None)))
+    except TypeError:
+        pass  # Not weak referenceable, not cached.
+
+    return k
+
+
+def _grab(value):
+    """
+    Return the value to store: immutable values as is, copies of dicts, lists and tuples,
+    and the repr of anything else.
+
+    :param value: Value to store.
+    :return: Stored value.
+    """
+    if isinstance(value, _IMMUTABLE):
+        return value
+    elif isinstance(value, (dict, list, tuple)):
+        return _copy(value)
+    else:
+        return value.__repr__()
+
+
+class Recorder(dict):
+    _WIDTH = 140
+    _BAR = "=" * _WIDTH
+
+    __slots__ = ()
 
     def store_args(self, key: Union[str, object], suppress: Optional[Set[str]] = None) -> None:
         """
@@ -52,28 +180,30 @@ class Recorder(defaultdict):
         {'a': 1, 'extra_param': 123, 'param1': 42, 'param2': 22, 'varargs': (2, 3)}
 
         """
-        if suppress is None:
-            suppress = set()
+        suppress = frozenset(suppress) if suppress else _NO_SUPPRESS
 
-        key = self._make_key(key)
+        key = _make_key(key)
 
-        v = self[key]
-        frame = inspect.currentframe().f_back
-        arg_values = inspect.getargvalues(frame)
+        v = self._bucket(key)
+        # sys._getframe() is CPython-specific, as is the f_locals access done here.
+        frame = sys._getframe(1)
+        locs = frame.f_locals
+        args, varargs, keywords = _arg_plan(frame.f_code, suppress)
 
-        for a in arg_values.args:
-            if a != "self" and a not in suppress:
-                v[a] = self._grab(arg_values.locals[a])
+        for a in args:
+            v[a] = _grab(locs[a])
 
-        varargs = arg_values.varargs
-        if arg_values.varargs is not None:
-            varargs = arg_values.locals[varargs]
-            if len(varargs) > 0:
-                v["varargs"] = self._grab(varargs)
+        if varargs is not None:
+            varargs = locs[varargs]
+            if varargs:
+                v["varargs"] = _grab(varargs)
 
-        keywords = arg_values.keywords
-        if arg_values.varargs is not None:
-            v.update(self._grab(arg_values.locals[keywords]))
+        if keywords is not None:
+            keywords = locs[keywords]
+            if _all_immutable(keywords.values()):
+                v.update(keywords)
+            else:
+                v.update(_grab(keywords))
 
     def store_locals(self, key: Union[str, object], variable_names: Iterable[str]) -> None:
         """
@@ -101,17 +231,25 @@ class Recorder(defaultdict):
         {'my_local': 42}
 
         """
-        key = self._make_key(key)
+        key = _make_key(key)
 
-        v = self[key]
-        frame = inspect.currentframe().f_back
-        arg_values = inspect.getargvalues(frame)
+        v = self._bucket(key)
+        locs = sys._getframe(1).f_locals
 
-        for n in variable_names:
-            if n in arg_values.locals:
-                v[n] = self._grab(arg_values.locals[n])
-            else:
-                raise KeyError(f"Variable '{n}' not found in locals variables.")
+        variable_names = tuple(variable_names)
+        if not variable_names:
+            return
+
+        try:
+            values = itemgetter(*variable_names)(locs)
+        except KeyError as e:
+            raise KeyError(f"Variable '{e.args[0]}' not found in locals variables.") from None
+
+        if len(variable_names) == 1:
+            values = (values,)
+
+        for n, value in zip(variable_names, values):
+            v[n] = _grab(value)
 
     def store_properties(self, key: Union[str, object], obj, property_names: Optional[Iterable[str]] = None,) -> None:
         """
@@ -143,19 +281,37 @@ class Recorder(defaultdict):
         {'a': 1, 'c': 3}
 
         """
-        key = self._make_key(key)
+        key = _make_key(key)
 
-        v = self[key]
+        v = self._bucket(key)
 
-        if property_names is not None:
-            for p in property_names:
-                if p in obj.__dict__:
-                    v[p] = self._grab(obj.__dict__[p])
-                else:
-                    raise KeyError(f"Property '{p}' not found in object '{obj}'.")
+        d = obj.__dict__
+
+        if property_names is None:
+            for p, value in d.items():
+                v[p] = _grab(value)
+            return
+
+        names = property_names if isinstance(property_names, (list, tuple)) else list(property_names)
+
+        if len(names) <= 4 or len(names) < len(d) // 4:
+            # Few names: one probe per name, all looked up before anything is stored.
+            try:
+                values = [d[p] for p in names]
+            except KeyError as e:
+                raise KeyError(f"Property '{e.args[0]}' not found in object '{obj}'.") from None
+
+            for p, value in zip(names, values):
+                v[p] = _grab(value)
         else:
-            for key, value in obj.__dict__.items():
-                v[key] = self._grab(value)
+            # Many names: validated with a single set difference.
+            missing = set(names) - d.keys()
+            if missing:
+                p = next(p for p in names if p in missing)
+                raise KeyError(f"Property '{p}' not found in object '{obj}'.")
+
+            for p in names:
+                v[p] = _grab(d[p])
 
     def store_values(self, key: Union[str, object], arg: Dict) -> None:
         """
@@ -178,7 +334,7 @@ class Recorder(defaultdict):
 
         """
 
-        self[key].update(self._grab(arg))
+        self._bucket(_make_key(key)).update(_grab(arg))
 
     def format(self, header="", compact=True) -> str:
         """
@@ -196,20 +352,24 @@ class Recorder(defaultdict):
         {'a': 1, 'extra_param': 123, 'param1': 42, 'param2': 22, 'varargs': (2, 3)}
 
         """
-        lines = [
-            "",
-            f"{header:=^140}",
-        ]
+        buf = io.StringIO()
+        w = buf.write
+        _center = str.center
+        width = self._WIDTH
+
+        w("\n")
+        w(_center(header, width, "=") if header else self._BAR)
 
         for k, v in super().items():
-            lines.append("")
-            lines.append(f"{' ' + k + ' ':-^140}")
-            lines.append(pformat(v, width=120, compact=compact))
+            w("\n\n")
+            w(_center(f" {k} ", width, "-"))
+            w("\n")
+            w(pformat(v, width=120, compact=compact))
 
-        lines.append("")
-        lines.append("=" * 140)
+        w("\n\n")
+        w(self._BAR)
 
-        return "\n".join(lines)
+        return buf.getvalue()
 
     def print_to_log(self, output_logger=None, header="", compact=True) -> None:
         """
@@ -228,43 +388,162 @@ class Recorder(defaultdict):
         """
 
         log = output_logger if output_logger is not None else logger
+
+        # Formatting is the expensive part, skip it when INFO records are filtered out.
+        if not log.isEnabledFor(logging.INFO):
+            return
+
         log.info(self.format(header=header, compact=compact))
 
+    def dump(self, f: BinaryIO) -> None:
+        """
+        Write the current stored values to a binary file with pickle.
+
+        Much cheaper than format() on large values; prefer it when the output is read by
+        a program rather than a person.
+
+        :param f: File object opened for binary writing.
+        :return: None
+        """
+        pickle.dump(dict(self), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, f: BinaryIO) -> "Recorder":
+        """
+        Read values written by dump() into a new Recorder.
+
+        Uses pickle: only load trusted files written by dump().
+
+        :param f: File object opened for binary reading.
+        :return: Recorder with the loaded values.
+        """
+        r = cls()
+        r.update(pickle.load(f))
+        return r
+
     def clear(self):
         """
         Remove all items.
         """
         super().clear()
 
-    @staticmethod
-    def _make_key(key: Union[str, object]) -> str:
+    def _bucket(self, key: str) -> Dict:
         """
-        Create a string key from objects class name and id.
+        Return the values stored under the given key, creating an empty dict if needed.
 
-        :param key: Key
-        :return: String representation for the key.
+        :param key: String key.
+        :return: Dict of stored values.
         """
-        if not isinstance(key, str):
-            return f"{key.__class__.__name__} {key.__class__} object at 0x{id(key):x}"
-        else:
-            return key
+        b = self.get(key)
+        if b is None:
+            b = self[key] = {}
+        return b
 
-    @staticmethod
-    def _grab(value):
-        if isinstance(value, (dict, list, tuple)):
-            return deepcopy(value)
-        elif isinstance(value, (bool, int, float, complex, str)):
-            return value
-        else:
-            return value.__repr__()
+    _make_key = staticmethod(_make_key)
+    _grab = staticmethod(_grab)
 
 
-recorders = defaultdict(Recorder)
+recorders: Dict[str, Recorder] = {}
+_lock = threading.Lock()
 
 
 def get_recorder(name: str) -> Recorder:
-    return recorders[name]
+    r = recorders.get(name)
+    if r is None:
+        with _lock:
+            r = recorders.setdefault(name, Recorder())
+    return r
 
 
 def del_recorder(name: str) -> None:
-    del recorders[name]
+    with _lock:
+        del recorders[name]
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler that silently drops records when its queue is full.
+    """
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+class _BoundedQueueListener(QueueListener):
+    """
+    QueueListener that waits for room in a bounded queue to enqueue its stop sentinel.
+    """
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+_saved_handlers: List[logging.Handler] = []
+_saved_propagate = True
+
+
+def enable_async_logging(handler: logging.Handler, maxsize: int = 1024) -> None:
+    """
+    Emit the records of print_to_log() from a background thread.
+
+    Records of this module's logger are put in a bounded queue and written to the given
+    handler by a QueueListener thread, which removes the handler I/O from the caller.
+    The recorder output is still formatted by the caller, while the recorder content is
+    current. Loggers passed to print_to_log() through output_logger are not affected.
+    Nothing is queued unless this module's logger is enabled for INFO, since
+    print_to_log() returns early otherwise.
+
+    The logger stops propagating while async logging is enabled, so root and ancestor
+    handlers no longer receive recorder output. Records are silently dropped when the
+    queue is full, and records still queued are lost if the process dies before
+    disable_async_logging() is called.
+
+    :param handler: Handler that writes the records.
+    :param maxsize: Maximum number of records waiting in the queue.
+    :return: None
+    """
+    global _listener, _queue_handler, _saved_handlers, _saved_propagate
+
+    with _lock:
+        if _listener is not None:
+            raise RuntimeError("Async logging is already enabled.")
+
+        q = queue.Queue(maxsize)
+        _listener = _BoundedQueueListener(q, handler, respect_handler_level=True)
+        _queue_handler = _DroppingQueueHandler(q)
+
+        _saved_handlers = logger.handlers[:]
+        _saved_propagate = logger.propagate
+        for h in _saved_handlers:
+            logger.removeHandler(h)
+        logger.addHandler(_queue_handler)
+        logger.propagate = False
+
+        _listener.start()
+
+
+def disable_async_logging() -> None:
+    """
+    Flush the queued records and restore the synchronous handlers of this module's logger.
+
+    :return: None
+    """
+    global _listener, _queue_handler
+
+    with _lock:
+        if _listener is None:
+            return
+
+        logger.removeHandler(_queue_handler)
+        for h in _saved_handlers:
+            logger.addHandler(h)
+        logger.propagate = _saved_propagate
+
+        _listener.stop()
+        _listener = None
+        _queue_handler = None
@@ -1,9 +1,11 @@
+import io
 import logging
+import threading
 import pytest
 
 logging.basicConfig(level=logging.DEBUG)
 
-from blackbox_recorder.recorder import get_recorder, del_recorder
+from blackbox_recorder.recorder import Recorder, get_recorder, del_recorder, enable_async_logging, disable_async_logging
 
 
 def test_store_args():
@@ -29,6 +31,33 @@ def test_store_args():
     del_recorder("test")
 
 
+def test_store_args_suppress():
+    storage = get_recorder("test")
+
+    def f(a, b, c):
+        storage.store_args("f", suppress={"b"})
+
+    f(1, 2, 3)
+    f(4, 5, 6)
+
+    assert storage["f"] == {"a": 4, "c": 6}
+
+    del_recorder("test")
+
+
+def test_store_args_kwargs_without_varargs():
+    storage = get_recorder("test")
+
+    def f(a, **kwargs):
+        storage.store_args("f")
+
+    f(1, **{"only_kw": 1})
+
+    assert storage["f"] == {"a": 1, "only_kw": 1}
+
+    del_recorder("test")
+
+
 def test_store_locals():
     storage = get_recorder("test")
 
@@ -46,6 +75,24 @@ def test_store_locals():
     del_recorder("test")
 
 
+def test_store_locals_multiple():
+    storage = get_recorder("test")
+
+    def my_func():
+        first = 1
+        second = [2, 3]
+        third = "three"
+
+        storage.store_locals("my_func", ["third", "first", "second"])
+        second.append(4)
+
+    my_func()
+
+    assert list(storage["my_func"].items()) == [("third", "three"), ("first", 1), ("second", [2, 3])]
+
+    del_recorder("test")
+
+
 def test_store_locals_with_error():
     storage = get_recorder("test")
 
@@ -59,6 +106,8 @@ def test_store_locals_with_error():
     with pytest.raises(KeyError):
         my_func()
 
+    assert storage["my_func"] == {}
+
     del_recorder("test")
 
 
@@ -85,6 +134,34 @@ def test_store_properties_with_property_list():
     del_recorder("test")
 
 
+def test_store_properties_with_long_property_list():
+    storage = get_recorder("test")
+
+    class A:
+        def __init__(self) -> None:
+            super().__init__()
+
+            for i in range(8):
+                setattr(self, f"p{i}", i)
+
+    a = A()
+
+    storage.store_properties("my_key", a, (f"p{i}" for i in reversed(range(6))))
+
+    assert list(storage["my_key"].items()) == [(f"p{i}", i) for i in reversed(range(6))]
+
+    with pytest.raises(KeyError):
+        storage.store_properties("other_key", a, [f"p{i}" for i in range(5)] + ["xxxx"])
+
+    with pytest.raises(KeyError):
+        storage.store_properties("short_key", a, ["p0", "xxxx"])
+
+    assert storage["other_key"] == {}
+    assert storage["short_key"] == {}
+
+    del_recorder("test")
+
+
 def test_store_properties_without_property_list():
     storage = get_recorder("test")
 
@@ -120,3 +197,174 @@ def test_store_settings():
     assert storage["my_key"]["c"] == 3
 
     del_recorder("test")
+
+
+def test_store_values_are_copied():
+    storage = get_recorder("test")
+
+    nested = {"a": [1, 2], "b": (3, [4]), "c": None}
+    storage.store_values("my_key", {"nested": nested})
+    nested["a"].append(5)
+    nested["b"][1].append(6)
+
+    assert storage["my_key"]["nested"] == {"a": [1, 2], "b": (3, [4]), "c": None}
+
+    del_recorder("test")
+
+
+def test_print_to_log_disabled_level():
+    storage = get_recorder("test")
+
+    class Unformattable:
+        def __repr__(self):
+            raise AssertionError("format() should not run")
+
+    storage.store_values("my_key", {"a": 1})
+    storage["my_key"]["b"] = Unformattable()
+
+    quiet = logging.getLogger("blackbox_recorder_tests.quiet")
+    quiet.setLevel(logging.WARNING)
+    storage.print_to_log(output_logger=quiet)
+
+    del_recorder("test")
+
+
+def test_store_values_keys_are_copied():
+    storage = get_recorder("test")
+
+    class K:
+        def __init__(self, x):
+            self.x = x
+
+        def __repr__(self):
+            return f"K({self.x})"
+
+    k = K(1)
+    storage.store_values("my_key", {k: 1})
+    k.x = 2
+
+    assert repr(storage["my_key"]) == "{K(1): 1}"
+
+    del_recorder("test")
+
+
+def test_store_values_cyclic_and_shared():
+    storage = get_recorder("test")
+
+    cyclic = [1]
+    cyclic.append(cyclic)
+    shared = [2]
+    storage.store_values("my_key", {"x": cyclic, "p": shared, "q": shared})
+
+    x = storage["my_key"]["x"]
+    assert x is not cyclic
+    assert x[0] == 1
+    assert x[1] is x
+    assert storage["my_key"]["p"] is storage["my_key"]["q"]
+
+    del_recorder("test")
+
+
+def test_missing_key_is_not_created():
+    storage = get_recorder("test")
+
+    with pytest.raises(KeyError):
+        storage["missing"]
+
+    assert "missing" not in storage
+
+    del_recorder("test")
+
+
+def test_print_to_log_async():
+    storage = get_recorder("test")
+
+    class ListHandler(logging.Handler):
+        def __init__(self):
+            super().__init__()
+            self.messages = []
+
+        def emit(self, record):
+            self.messages.append(record.getMessage())
+
+    recorder_logger = logging.getLogger("blackbox_recorder.recorder")
+    level = recorder_logger.level
+    recorder_logger.setLevel(logging.INFO)
+
+    handler = ListHandler()
+    enable_async_logging(handler)
+    try:
+        with pytest.raises(RuntimeError):
+            enable_async_logging(handler)
+
+        storage.store_values("my_key", {"a": 1})
+        storage.print_to_log(header="async")
+    finally:
+        disable_async_logging()
+        recorder_logger.setLevel(level)
+
+    assert len(handler.messages) == 1
+    assert "my_key" in handler.messages[0]
+    assert "{'a': 1}" in handler.messages[0]
+
+    del_recorder("test")
+
+
+def test_make_key_cache():
+    storage = get_recorder("test")
+
+    class A:
+        pass
+
+    a = A()
+    key = storage._make_key(a)
+
+    assert storage._make_key(a) == key
+    assert storage._make_key(A()) != key
+    assert storage._make_key(42) == f"int {int} object at 0x{id(42):x}"
+
+    del_recorder("test")
+
+
+def test_print_to_log_async_full_queue(capsys):
+    storage = get_recorder("test")
+
+    recorder_logger = logging.getLogger("blackbox_recorder.recorder")
+    level = recorder_logger.level
+    recorder_logger.setLevel(logging.INFO)
+
+    release = threading.Event()
+
+    class BlockingHandler(logging.Handler):
+        def emit(self, record):
+            release.wait(5)
+
+    enable_async_logging(BlockingHandler(), maxsize=1)
+    try:
+        storage.store_values("my_key", {"a": 1})
+        for _ in range(5):
+            storage.print_to_log()
+    finally:
+        release.set()
+        disable_async_logging()
+        recorder_logger.setLevel(level)
+
+    assert "Logging error" not in capsys.readouterr().err
+
+    del_recorder("test")
+
+
+def test_dump_and_load():
+    storage = get_recorder("test")
+
+    storage.store_values("my_key", {"a": 1, "b": [2, 3], "c": b"data"})
+
+    f = io.BytesIO()
+    storage.dump(f)
+    f.seek(0)
+    loaded = Recorder.load(f)
+
+    assert isinstance(loaded, Recorder)
+    assert loaded == storage
+
+    del_recorder("test")